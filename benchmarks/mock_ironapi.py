@@ -0,0 +1,173 @@
+# Copyright (c) 2025 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# File: mock_ironapi.py
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions
+# and limitations under the License.
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+CREATED = "2020-01-01T00:00:00Z"
+
+
+def make_alert(index, padding=""):
+    return {
+        "id": f"alert-{index}",
+        "category": "C2",
+        "sub_category": "BEACON",
+        "severity": 500 + index % 500,
+        "status": "STATUS_AWAITING_REVIEW",
+        "created": CREATED,
+        "updated": f"2020-01-01T00:{index // 60 % 60:02d}:{index % 60:02d}Z",
+        "description": padding,
+    }
+
+
+def make_event(index, alert_count, padding=""):
+    return {
+        "id": f"event-{index}",
+        "alert_id": f"alert-{index % alert_count}",
+        "category": "C2",
+        "sub_category": "BEACON",
+        "severity": 500 + index % 500,
+        "created": CREATED,
+        "updated": CREATED,
+        "description": padding,
+    }
+
+
+class MockIronApi:
+    # Local stand-in for the IronAPI. The notification endpoints behave like queues, every request
+    # consumes up to limit notifications, and every other endpoint returns synthetic records.
+    # payload_bytes pads each record and latency delays each response by that many seconds
+    def __init__(self, notifications=1000, payload_bytes=256, latency=0.0, alerts=100):
+        self.latency = latency
+        self.alerts = alerts
+        self.padding = "x" * payload_bytes
+        self.calls = {}
+        self._lock = threading.Lock()
+        self._queues = {
+            "/GetAlertNotifications": (
+                "alert_notifications",
+                [
+                    {"alert_action": "ANA_ALERT_CREATED", "alert": make_alert(i % alerts, self.padding), "created": CREATED}
+                    for i in range(notifications)
+                ],
+            ),
+            "/GetDomeNotifications": (
+                "dome_notifications",
+                [
+                    {
+                        "id": i,
+                        "category": "DNC_COMMENT_ADDED",
+                        "alert_ids": [f"alert-{i % alerts}"],
+                        "created": CREATED,
+                        "dome_tags": [],
+                        "comment": self.padding,
+                    }
+                    for i in range(notifications)
+                ],
+            ),
+            "/GetEventNotifications": (
+                "event_notifications",
+                [
+                    {"event_action": "ENA_EVENT_CREATED", "event": make_event(i, alerts, self.padding), "created": CREATED}
+                    for i in range(notifications)
+                ],
+            ),
+        }
+        self._server = None
+        self.url = None
+
+    def start(self):
+        api = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # headers and body are written separately, without this every response waits on a delayed ACK
+            disable_nagle_algorithm = True
+
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                request = json.loads(self.rfile.read(length) or b"null") or {}
+                endpoint = self.path.split("/IronApi", 1)[-1]
+                if api.latency:
+                    time.sleep(api.latency)
+                body = json.dumps(api.respond(endpoint, request)).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        class Server(ThreadingHTTPServer):
+            # the default listen backlog of 5 drops connections when many requests are in flight
+            request_queue_size = 1024
+            daemon_threads = True
+
+        self._server = Server(("127.0.0.1", 0), Handler)
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self._server.server_address[1]}"
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def respond(self, endpoint, request):
+        with self._lock:
+            self.calls[endpoint] = self.calls.get(endpoint, 0) + 1
+            if endpoint in self._queues:
+                key, queue = self._queues[endpoint]
+                limit = request.get("limit", 500)
+                page = queue[:limit]
+                del queue[:limit]
+                return {key: page}
+
+        if endpoint == "/GetAlerts":
+            constraint = request.get("constraint") or {}
+            offset = constraint.get("offset", 0)
+            limit = constraint.get("limit", 50)
+            alerts = [make_alert(i, self.padding) for i in range(offset, min(offset + limit, self.alerts))]
+            return {"alerts": alerts, "constraint": {"total": self.alerts, "offset": offset, "limit": limit}}
+        if endpoint == "/GetEvents":
+            events = [make_event(i, self.alerts, self.padding) for i in range(10)]
+            return {"events": events, "constraint": {"total": len(events), "offset": 0, "limit": len(events)}}
+        if endpoint == "/GetEvent":
+            return {"event": make_event(0, self.alerts, self.padding) | {"id": request.get("event_id")}, "context": []}
+        if endpoint == "/GetAlertIronDomeInformation":
+            return {"alert_id": request.get("alert_id"), "dome_notifications": [], "correlations": []}
+        # /Login and the write endpoints return an empty object
+        return {}
+
+    @property
+    def round_trips(self):
+        with self._lock:
+            return sum(self.calls.values())
@@ -0,0 +1,62 @@
+# Copyright (c) 2025 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# File: action_result.py
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions
+# and limitations under the License.
+class ActionResult:
+    def __init__(self, param=None):
+        self._param = param or {}
+        self._data = []
+        self._summary = {}
+        self._status = False
+        self._message = ""
+
+    def set_status(self, status, message="", exception=None):
+        self._status = status
+        self._message = message
+        return status
+
+    def get_status(self):
+        return self._status
+
+    def get_message(self):
+        return self._message
+
+    def get_param(self):
+        return self._param
+
+    def add_data(self, data):
+        self._data.append(data)
+
+    def get_data(self):
+        return self._data
+
+    def add_debug_data(self, data):
+        pass
+
+    def update_summary(self, summary):
+        self._summary.update(summary)
+        return self._summary
+
+    def get_summary(self):
+        return self._summary
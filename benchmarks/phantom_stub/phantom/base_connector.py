@@ -0,0 +1,103 @@
+# Copyright (c) 2025 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# File: base_connector.py
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions
+# and limitations under the License.
+import tempfile
+
+
+class BaseConnector:
+    # Keeps containers, artifacts and state in memory and counts the platform calls made by the connector
+    def __init__(self):
+        self.config = {}
+        self.action_id = None
+        self.state = {}
+        self.action_results = []
+        self.containers = {}
+        self.artifacts = 0
+        self.platform_calls = {"save_container": 0, "save_artifact": 0, "save_artifacts": 0, "save_state": 0}
+        self._state_dir = None
+
+    def get_config(self):
+        return self.config
+
+    def get_action_identifier(self):
+        return self.action_id
+
+    def get_asset_id(self):
+        return "benchmark"
+
+    def get_state_dir(self):
+        if self._state_dir is None:
+            self._state_dir = tempfile.mkdtemp(prefix="ironnet_benchmark_")
+        return self._state_dir
+
+    def load_state(self):
+        return self.state
+
+    def save_state(self, state):
+        self.platform_calls["save_state"] += 1
+        self.state = state
+
+    def save_progress(self, *args, **kwargs):
+        pass
+
+    def send_progress(self, *args, **kwargs):
+        pass
+
+    def debug_print(self, *args, **kwargs):
+        pass
+
+    def error_print(self, *args, **kwargs):
+        pass
+
+    def add_action_result(self, action_result):
+        self.action_results.append(action_result)
+        return action_result
+
+    def get_action_results(self):
+        return self.action_results
+
+    def save_container(self, container):
+        self.platform_calls["save_container"] += 1
+        sdi = container.get("source_data_identifier")
+        if sdi in self.containers:
+            return True, "Duplicate container found", self.containers[sdi]
+        self.containers[sdi] = len(self.containers) + 1
+        return True, "Container created", self.containers[sdi]
+
+    def save_artifact(self, artifact):
+        self.platform_calls["save_artifact"] += 1
+        self.artifacts += 1
+        return True, "Artifact created", self.artifacts
+
+    def save_artifacts(self, artifacts):
+        self.platform_calls["save_artifacts"] += 1
+        ids = list(range(self.artifacts + 1, self.artifacts + len(artifacts) + 1))
+        self.artifacts += len(artifacts)
+        return True, "Artifacts created", ids
+
+    def get_container_info(self, container_id=None):
+        if container_id in self.containers.values():
+            return True, {"id": container_id}, 200
+        return False, "Container not found", 404
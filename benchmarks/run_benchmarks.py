@@ -0,0 +1,215 @@
+# Copyright (c) 2025 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# File: run_benchmarks.py
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions
+# and limitations under the License.
+#
+# Offline benchmarks for the IronNet connector. Every scenario runs in its own process against
+# a local mock IronAPI and a stubbed BaseConnector, and reports records per second, peak RSS,
+# IronAPI round trips, platform calls and the cold start time of importing and initializing the connector.
+#
+#   python benchmarks/run_benchmarks.py --notifications 5000 --latency 0.005 --output results.json
+#   python benchmarks/run_benchmarks.py --baseline results.json --tolerance 0.2
+#
+# With --baseline the run exits with status 1 when a scenario is slower by more than the
+# tolerance or makes more round trips or platform calls than the baseline.
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+APP_DIR = os.path.dirname(BENCHMARK_DIR)
+
+# the stubbed platform modules are used even when the SOAR SDK is installed, so the platform calls can be counted
+sys.path[:0] = [os.path.join(BENCHMARK_DIR, "phantom_stub"), APP_DIR, BENCHMARK_DIR]
+
+# action, asset config overrides, action parameters and number of runs for each scenario.
+# The response cache is disabled so every run of a query action reaches the mock IronAPI
+SCENARIOS = {
+    "poll": ("on_poll", {}, {}, 1),
+    "poll_concurrent": ("on_poll", {"concurrent_poll": True}, {}, 1),
+    "poll_streamed": ("on_poll", {"stream_responses": True}, {}, 1),
+    "get_alerts": ("irondefense_get_alerts", {}, {"max_results": 0}, 1),
+    "get_events": ("irondefense_get_events", {"response_cache_size": 0}, {"alert_id": "alert-1"}, 100),
+    "get_event": ("irondefense_get_event", {"response_cache_size": 0}, {"event_id": ",".join(f"event-{i}" for i in range(100))}, 1),
+    "get_event_async": (
+        "irondefense_get_event",
+        {"response_cache_size": 0, "async_transport": True},
+        {"event_id": ",".join(f"event-{i}" for i in range(100))},
+        1,
+    ),
+}
+
+
+def peak_rss_mb():
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def asset_config(url, overrides):
+    # start from the defaults the platform would fill in from the app JSON
+    with open(os.path.join(APP_DIR, "ironnet.json")) as f:
+        configuration = json.load(f)["configuration"]
+    config = {name: spec["default"] for name, spec in configuration.items() if "default" in spec}
+    config.update(
+        {
+            "base_url": url,
+            "username": "benchmark",
+            "password": "benchmark",
+            "enable_dome_notifications": True,
+            "enable_event_notifications": True,
+            "alert_severity_lower": 0,
+            "event_severity_lower": 0,
+            "drain_time_budget": 3600,
+            "debug_capture": "off",
+        }
+    )
+    config.update(overrides)
+    return config
+
+
+def run_scenario(name, args):
+    from mock_ironapi import MockIronApi
+
+    action, overrides, param, runs = SCENARIOS[name]
+    api = MockIronApi(args.notifications, args.payload_bytes, args.latency, args.alerts).start()
+    try:
+        # the platform starts a new process for every action run, so the connector import is part of the cold start
+        started = time.perf_counter()
+        from ironnet_connector import IronnetConnector
+
+        connector = IronnetConnector()
+        connector.action_id = action
+        connector.config = asset_config(api.url, overrides)
+        if not connector.initialize():
+            raise RuntimeError(f"Connector initialization failed for scenario {name}")
+        cold_start = time.perf_counter() - started
+
+        started = time.perf_counter()
+        ret_val = all([connector.handle_action(param) for _ in range(runs)])
+        elapsed = time.perf_counter() - started
+        connector.finalize()
+    finally:
+        api.stop()
+
+    if action == "on_poll":
+        counts = connector._perf.report()["counts"]
+        records = sum(count for key, count in counts.items() if key.endswith("_fetched"))
+    else:
+        # get alerts adds one data item per page of alerts, the other query actions add the whole response
+        records = 0
+        for action_result in connector.get_action_results():
+            for data in action_result.get_data():
+                key = next((key for key in ("alerts", "events") if isinstance(data, dict) and key in data), None)
+                records += len(data[key]) if key is not None else 1
+
+    return {
+        "success": bool(ret_val),
+        "elapsed": round(elapsed, 4),
+        "records": records,
+        "records_per_second": round(records / elapsed, 1) if elapsed else 0,
+        "peak_rss_mb": peak_rss_mb(),
+        "cold_start_ms": round(cold_start * 1000, 1),
+        "round_trips": api.round_trips,
+        "platform_calls": sum(count for key, count in connector.platform_calls.items() if key != "save_state"),
+    }
+
+
+def regressions(results, baseline, tolerance):
+    found = []
+    for name, result in results.items():
+        expected = baseline.get(name)
+        if expected is None:
+            continue
+        if result["records_per_second"] < expected["records_per_second"] * (1 - tolerance):
+            found.append(f"{name}: {result['records_per_second']} records/s, baseline {expected['records_per_second']}")
+        for metric in ("round_trips", "platform_calls"):
+            if result[metric] > expected[metric]:
+                found.append(f"{name}: {result[metric]} {metric}, baseline {expected[metric]}")
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline IronNet connector benchmarks")
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS), help="Scenario to run, may be repeated (default: all)")
+    parser.add_argument("--notifications", type=int, default=2000, help="Notifications queued in each notification feed")
+    parser.add_argument("--alerts", type=int, default=500, help="Distinct alerts served by the mock IronAPI")
+    parser.add_argument("--payload-bytes", type=int, default=256, help="Padding added to every synthetic record")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds the mock IronAPI waits before each response")
+    parser.add_argument("--output", help="Write the results as JSON to this file")
+    parser.add_argument("--baseline", help="Compare against results previously written with --output")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed throughput drop against the baseline")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    scenarios = args.scenario or list(SCENARIOS)
+    if args.worker:
+        print(json.dumps(run_scenario(scenarios[0], args)))
+        return 0
+
+    # each scenario gets a fresh process so peak RSS is measured per scenario
+    passthrough = [
+        f"--notifications={args.notifications}",
+        f"--alerts={args.alerts}",
+        f"--payload-bytes={args.payload_bytes}",
+        f"--latency={args.latency}",
+    ]
+    results = {}
+    for name in scenarios:
+        output = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--worker", f"--scenario={name}", *passthrough],
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+        results[name] = json.loads(output.strip().splitlines()[-1])
+        result = results[name]
+        print(
+            f"{name:<16} {'ok' if result['success'] else 'FAILED':<7} {result['records']:>7} records "
+            f"{result['records_per_second']:>10.1f}/s {result['elapsed']:>8.3f}s {result['peak_rss_mb']:>7.1f} MB "
+            f"{result['round_trips']:>5} round trips {result['platform_calls']:>5} platform calls "
+            f"{result['cold_start_ms']:>6.1f} ms cold start"
+        )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=4)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            found = regressions(results, json.load(f), args.tolerance)
+        for regression in found:
+            print(f"Regression: {regression}")
+        return 1 if found else 0
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
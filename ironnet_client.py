@@ -0,0 +1,999 @@
+# Copyright (c) 2025 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# File: ironnet_client.py
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions
+# and limitations under the License.
+import codecs
+import json
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+import phantom.app as phantom
+
+
+RETRY_STATUS_CODES = (429, 502, 503, 504)
+# Writes that are not idempotent, a lost response does not mean they were not applied. They are only
+# retried when the request never reached the IronAPI or it was turned away before being processed
+WRITE_ENDPOINTS = ("/CommentOnAlert", "/RateAlert", "/SetAlertStatus", "/ReportObservedBadActivity")
+WRITE_RETRY_STATUS_CODES = (429, 503)
+MAX_RETRY_DELAY = 120
+
+# Debug capture policies for request payloads and response bodies
+DEBUG_CAPTURE_FULL = "full"
+DEBUG_CAPTURE_TRUNCATED = "truncated"
+DEBUG_CAPTURE_FAILURE = "failure only"
+DEBUG_CAPTURE_OFF = "off"
+DEBUG_CAPTURE_POLICIES = (DEBUG_CAPTURE_FULL, DEBUG_CAPTURE_TRUNCATED, DEBUG_CAPTURE_FAILURE, DEBUG_CAPTURE_OFF)
+
+# Notification feed endpoints
+FEED_ENDPOINTS = {"alert": "/GetAlertNotifications", "dome": "/GetDomeNotifications", "event": "/GetEventNotifications"}
+
+
+class RetVal(tuple):
+    def __new__(cls, val1, val2=None):
+        return tuple.__new__(RetVal, (val1, val2))
+
+
+class JsonArrayStream:
+    # Incrementally decodes the elements of one top-level array in a streamed JSON response body,
+    # so only the current chunk and element are held in memory instead of the whole page
+    def __init__(self, response, key, chunk_size=65536, on_close=None):
+        self._response = response
+        self._key = key
+        self._chunk_size = chunk_size
+        self._on_close = on_close
+        self.count = 0
+        self.bytes_read = 0
+        self.error = None
+
+    def __iter__(self):
+        try:
+            yield from self._iter_elements()
+        except Exception as e:
+            self.error = e
+        finally:
+            self._response.close()
+            if self._on_close is not None:
+                self._on_close(self.bytes_read)
+
+    def _iter_elements(self):
+        decoder = json.JSONDecoder()
+        text_decoder = codecs.getincrementaldecoder("utf-8")()
+        chunks = self._response.iter_content(self._chunk_size)
+        marker = f'"{self._key}"'
+        buffer = ""
+        eof = False
+
+        def read():
+            nonlocal buffer, eof
+            chunk = next(chunks, None)
+            if chunk is None:
+                eof = True
+                buffer += text_decoder.decode(b"", final=True)
+            else:
+                self.bytes_read += len(chunk)
+                buffer += text_decoder.decode(chunk)
+
+        # find the opening bracket of the array, only keeping enough text to match the key across chunks
+        while True:
+            start = buffer.find(marker)
+            if start != -1:
+                bracket = buffer.find("[", start + len(marker))
+                if bracket != -1:
+                    buffer = buffer[bracket + 1 :]
+                    break
+            elif len(buffer) > len(marker):
+                buffer = buffer[-len(marker) :]
+            if eof:
+                raise ValueError(f"Key '{self._key}' not found in response")
+            read()
+
+        pos = 0
+        while True:
+            while pos < len(buffer) and buffer[pos] in " \t\r\n,":
+                pos += 1
+            if pos == len(buffer):
+                if eof:
+                    raise ValueError(f"Unterminated array '{self._key}' in response")
+                buffer = ""
+                pos = 0
+                read()
+                continue
+            if buffer[pos] == "]":
+                return
+            try:
+                element, end = decoder.raw_decode(buffer, pos)
+            except ValueError:
+                if eof:
+                    raise
+                read()
+                continue
+            if not isinstance(element, (dict, list)) and not eof and (end == len(buffer) or buffer[end] not in " \t\r\n,]"):
+                # a number or literal cut by the end of the buffer may continue in the next chunk, "1500." decodes as 1500
+                read()
+                continue
+            self.count += 1
+            yield element
+            buffer = buffer[end:]
+            pos = 0
+
+
+class TokenBucket:
+    # Thread-safe token bucket that allows rate calls per second with bursts of up to capacity calls
+    def __init__(self, rate, capacity=None):
+        self._rate = rate
+        self._capacity = capacity or max(1, rate)
+        self._tokens = self._capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        # Returns whether the caller had to wait for a token
+        waited = False
+        while True:
+            wait = self._take()
+            if not wait:
+                return waited
+            waited = True
+            time.sleep(wait)
+
+    async def acquire_async(self):
+        # Same as acquire, but waits without blocking the event loop
+        import asyncio
+
+        waited = False
+        while True:
+            wait = self._take()
+            if not wait:
+                return waited
+            waited = True
+            await asyncio.sleep(wait)
+
+    def _take(self):
+        # Takes a token and returns 0, or returns the time until the next token is available
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self._capacity, self._tokens + (now - self._updated) * self._rate)
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0
+            return (1 - self._tokens) / self._rate
+
+
+class CircuitBreaker:
+    # Skips an endpoint for a cool-down period after threshold consecutive failures. Endpoints are keyed
+    # by their URL, so the clients of several appliances can share one breaker. Requests from several
+    # threads update the breaker, so it keeps its own entries and the connector saves a snapshot of
+    # them with its state, which lets the cool-down also cover the following action runs
+    def __init__(self, entries, threshold, cooldown):
+        self._endpoints = {key: dict(entry) for key, entry in entries.items()}
+        self._threshold = threshold
+        self._cooldown = cooldown
+        self._lock = threading.Lock()
+
+    def snapshot(self):
+        with self._lock:
+            return {key: dict(entry) for key, entry in self._endpoints.items()}
+
+    def allow(self, key):
+        with self._lock:
+            return self._endpoints.get(key, {}).get("open_until", 0) <= time.time()
+
+    def record(self, key, success):
+        with self._lock:
+            if success:
+                self._endpoints.pop(key, None)
+                return
+            entry = self._endpoints.setdefault(key, {"failures": 0, "open_until": 0})
+            entry["failures"] += 1
+            if entry["failures"] >= self._threshold:
+                entry["open_until"] = time.time() + self._cooldown
+                # one more failure after the cool-down opens the breaker again
+                entry["failures"] = self._threshold - 1
+
+
+class ResponseCache:
+    # Size bounded LRU of read-only IronAPI responses kept in the connector state, with a TTL per
+    # endpoint. Entries are tagged with their alert id so write actions can invalidate them
+    def __init__(self, state, ttls, max_size):
+        self._entries = state.setdefault("response_cache", {})
+        self._ttls = ttls
+        self._max_size = max_size
+        # batch actions look up and store responses from several threads
+        self._lock = threading.Lock()
+
+    def is_cacheable(self, endpoint):
+        return self._ttls.get(endpoint, 0) > 0
+
+    @staticmethod
+    def _key(endpoint, data):
+        return endpoint + json.dumps(data, sort_keys=True, separators=(",", ":"))
+
+    def get(self, endpoint, data):
+        key = self._key(endpoint, data)
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is None or entry["expires"] <= time.time():
+                return None
+            # re-insert to mark the entry as most recently used
+            self._entries[key] = entry
+            return entry["response"]
+
+    def put(self, endpoint, data, response, alert_id=None):
+        if not self.is_cacheable(endpoint):
+            return
+        key = self._key(endpoint, data)
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = {"expires": time.time() + self._ttls[endpoint], "alert_id": alert_id, "response": response}
+            while len(self._entries) > self._max_size:
+                del self._entries[next(iter(self._entries))]
+
+    def invalidate_alert(self, alert_id):
+        with self._lock:
+            for key in [key for key, entry in self._entries.items() if entry["alert_id"] == alert_id]:
+                del self._entries[key]
+
+
+class PerfRecorder:
+    # Collects request latencies and payload sizes per endpoint, time spent per stage and record
+    # counts during an action run, and summarizes them as a performance report
+    def __init__(self):
+        self._latencies = {}
+        self._bytes = {}
+        self._timings = {}
+        self._counts = {}
+        # batch actions and the concurrent poll record requests from several threads
+        self._lock = threading.Lock()
+
+    def record_request(self, endpoint, seconds, nbytes=0):
+        with self._lock:
+            self._latencies.setdefault(endpoint, []).append(seconds)
+            self._bytes[endpoint] = self._bytes.get(endpoint, 0) + nbytes
+
+    def add_bytes(self, endpoint, nbytes):
+        with self._lock:
+            self._bytes[endpoint] = self._bytes.get(endpoint, 0) + nbytes
+
+    def add_time(self, stage, seconds):
+        with self._lock:
+            self._timings[stage] = self._timings.get(stage, 0.0) + seconds
+
+    def add_count(self, name, count=1):
+        with self._lock:
+            self._counts[name] = self._counts.get(name, 0) + count
+
+    @staticmethod
+    def _percentile(ordered, percent):
+        # nearest-rank percentile of an already sorted list
+        return ordered[max(0, -(-len(ordered) * percent // 100) - 1)]
+
+    def report(self, elapsed=None):
+        with self._lock:
+            endpoints = {}
+            for endpoint, latencies in self._latencies.items():
+                ordered = sorted(latencies)
+                endpoints[endpoint] = {
+                    "requests": len(ordered),
+                    "p50_ms": round(self._percentile(ordered, 50) * 1000, 1),
+                    "p95_ms": round(self._percentile(ordered, 95) * 1000, 1),
+                    "bytes": self._bytes.get(endpoint, 0),
+                }
+            report = {
+                "endpoints": endpoints,
+                "timings": {stage: round(seconds, 3) for stage, seconds in self._timings.items()},
+                "counts": dict(self._counts),
+            }
+        if elapsed is not None:
+            report["elapsed"] = round(elapsed, 3)
+        return report
+
+
+class BufferedResponse:
+    # requests.Response-like view of a fully read aiohttp response, so responses from the async
+    # transport go through the same processing as the ones from the requests session
+    def __init__(self, status_code, headers, content):
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+
+    @property
+    def text(self):
+        return self.content.decode("utf-8", "replace")
+
+    def json(self):
+        return json.loads(self.content)
+
+    def close(self):
+        pass
+
+
+class AsyncTransport:
+    # Runs IronAPI requests as coroutines on a single event loop with at most concurrency requests
+    # in flight. aiohttp is passed in by the client, which only imports it when the transport is enabled,
+    # and asyncio is imported by the coroutine code paths so actions without them do not load it
+    def __init__(self, client, aiohttp, concurrency):
+        self._client = client
+        self._aiohttp = aiohttp
+        self._concurrency = concurrency
+
+    def _session(self):
+        # the session has to be created inside the running event loop
+        client = self._client
+        return self._aiohttp.ClientSession(
+            auth=self._aiohttp.BasicAuth(client._username, client._password),
+            timeout=self._aiohttp.ClientTimeout(total=client._timeout),
+            connector=self._aiohttp.TCPConnector(limit=self._concurrency, ssl=None if client._verify_server_cert else False),
+        )
+
+    def not_sent(self, error):
+        # True when the connection to the IronAPI could not be opened, so the request was never sent
+        return isinstance(error, self._aiohttp.ClientConnectorError)
+
+    def post_all(self, calls, rate_limiter=None):
+        # Posts every (endpoint, action_result, data) call and returns their RetVals in order
+        import asyncio
+
+        return asyncio.run(self._post_all(calls, rate_limiter))
+
+    async def _post_all(self, calls, rate_limiter):
+        import asyncio
+
+        semaphore = asyncio.Semaphore(self._concurrency)
+
+        async def post(session, endpoint, action_result, data):
+            async with semaphore:
+                if rate_limiter is not None:
+                    await rate_limiter.acquire_async()
+                return await self._client.post_async(session, endpoint, action_result, data)
+
+        async with self._session() as session:
+            return await asyncio.gather(*(post(session, *call) for call in calls))
+
+    def fetch_feeds(self, feeds, budget, timeout, max_notifications=None):
+        # Pages through every (feed, limit, action_result) feed concurrently and returns, for each feed,
+        # its RetVal of fetched pages or the exception that ended the fetch
+        import asyncio
+
+        return asyncio.run(self._fetch_feeds(feeds, budget, timeout, max_notifications))
+
+    async def _fetch_feeds(self, feeds, budget, timeout, max_notifications):
+        import asyncio
+
+        async def fetch(session, feed, limit, action_result):
+            try:
+                return await asyncio.wait_for(self._fetch_pages(session, feed, limit, action_result, budget, max_notifications), timeout)
+            except asyncio.TimeoutError:
+                return FutureTimeoutError()
+            except Exception as e:
+                return e
+
+        async with self._session() as session:
+            return await asyncio.gather(*(fetch(session, *feed) for feed in feeds))
+
+    async def _fetch_pages(self, session, feed, limit, action_result, budget, max_notifications):
+        # Same paging rules as IronnetConnector._fetch_pages
+        deadline = time.monotonic() + budget
+        pages = []
+        fetched = 0
+        while True:
+            ret_val, response = await self._client.post_async(session, FEED_ENDPOINTS[feed], action_result, {"limit": limit})
+            if phantom.is_fail(ret_val):
+                return RetVal(ret_val, pages)
+            pages.append(response)
+            fetched += len(response[f"{feed}_notifications"])
+            if (
+                len(response[f"{feed}_notifications"]) < limit
+                or time.monotonic() >= deadline
+                or (max_notifications is not None and fetched >= max_notifications)
+            ):
+                return RetVal(ret_val, pages)
+
+
+class IronApiClient:
+    # IronAPI transport shared by the connector actions: a pooled keep-alive session with per-endpoint
+    # throttling, retries and a circuit breaker, response processing into action results, the
+    # response cache and concurrent fan-out on a thread pool or the optional async transport
+    def __init__(
+        self,
+        base_url,
+        username,
+        password,
+        verify_server_cert=True,
+        timeout=None,
+        pool_maxsize=10,
+        retry_count=0,
+        retry_backoff=0,
+        rate_limit=0,
+        endpoint_rate_limits=None,
+        circuit_breaker=None,
+        response_cache=None,
+        debug_capture=DEBUG_CAPTURE_TRUNCATED,
+        debug_capture_bytes=1024,
+        batch_parallelism=1,
+        perf=None,
+        progress=None,
+    ):
+        self._base_url = base_url
+        self._username = username
+        self._password = password
+        self._verify_server_cert = verify_server_cert
+        self._timeout = timeout
+        self._pool_maxsize = pool_maxsize
+        self._retry_count = retry_count
+        self._retry_backoff = retry_backoff
+        self._rate_limit = rate_limit
+        self._endpoint_rate_limits = endpoint_rate_limits or {}
+        self._rate_limiters = {}
+        self._circuit_breaker = circuit_breaker
+        self._response_cache = response_cache
+        self._debug_capture = debug_capture
+        self._debug_capture_bytes = debug_capture_bytes
+        self._batch_parallelism = batch_parallelism
+        self._perf = perf or PerfRecorder()
+        self._progress = progress or (lambda message: None)
+        self.async_transport = None
+        # the session, and with it the requests import, is only created by the first request
+        self._session = None
+        self._session_lock = threading.Lock()
+
+    def enable_async_transport(self, concurrency):
+        # aiohttp is optional, it is only imported when the async transport is selected
+        try:
+            import aiohttp
+        except ImportError:
+            return False
+        self.async_transport = AsyncTransport(self, aiohttp, concurrency)
+        return True
+
+    def close(self):
+        # Release the pooled connections
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+
+    def _get_session(self):
+        # batch actions make their first requests from several threads
+        with self._session_lock:
+            if self._session is None:
+                self._session = self._create_session()
+            return self._session
+
+    def _create_session(self):
+        # A single keep-alive session is shared by every IronAPI call made during this action run,
+        # so TLS handshakes and connection setup are only paid once per pooled connection.
+        # Retries are handled by post so they can be throttled and counted per endpoint.
+        # requests is imported here, actions that only use the async transport never load it
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self._pool_maxsize, max_retries=0)
+
+        session = requests.Session()
+        session.auth = (self._username, self._password)  # basic authentication
+        session.verify = self._verify_server_cert
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def _prepare_post(self, endpoint, method, data):
+        # Create a URL to connect to
+        url = self._base_url.encode("utf-8") + endpoint.encode("utf-8")
+
+        body = json.dumps(data)
+        if self._debug_capture == DEBUG_CAPTURE_FULL:
+            self._progress(f"Issuing {method} request on {url} w/ content: {data}")
+        elif self._debug_capture == DEBUG_CAPTURE_TRUNCATED:
+            self._progress(f"Issuing {method} request on {url} w/ content: {body[: self._debug_capture_bytes]}")
+        else:
+            self._progress(f"Issuing {method} request on {url}")
+        return url, body
+
+    def post(self, endpoint, action_result, method="post", data={}, stream_key=None, check_circuit=True, **kwargs):
+        # **kwargs can be any additional parameters that requests.request accepts
+        # stream_key names a top-level array of the response that is returned as a JsonArrayStream
+        # check_circuit=False sends the request even when the endpoint's circuit breaker is open
+        if kwargs["headers"] is None:
+            kwargs["headers"] = {"Content-Type": "application/json"}
+
+        try:
+            request_func = getattr(self._get_session(), method)
+        except AttributeError:
+            return RetVal(action_result.set_status(phantom.APP_ERROR, f"Invalid method: {method}"), None)
+
+        url, body = self._prepare_post(endpoint, method, data)
+        ret_val = self._check_circuit(endpoint, action_result) if check_circuit else phantom.APP_SUCCESS
+        if phantom.is_fail(ret_val):
+            return RetVal(ret_val, None)
+
+        attempt = 0
+        while True:
+            rate_limiter = self._get_rate_limiter(endpoint)
+            if rate_limiter is not None and rate_limiter.acquire():
+                self._count_api_stat(action_result, "api_throttle_waits")
+            started = time.perf_counter()
+            try:
+                # auth and certificate verification are configured on the pooled session
+                r = request_func(
+                    url,
+                    data=body,
+                    timeout=self._timeout,
+                    stream=stream_key is not None,
+                    **kwargs,
+                )
+                error_msg = None
+                not_sent = False
+            except Exception as e:
+                r = None
+                error_msg = str(e) or "Unknown error occurred. Please check the asset configuration parameters."
+                not_sent = self._not_sent(e)
+            # streamed bodies have not been read yet, their size is added once the stream is consumed
+            nbytes = len(r.content) if r is not None and stream_key is None else 0
+            self._perf.record_request(endpoint, time.perf_counter() - started, nbytes)
+
+            delay = self._next_retry(endpoint, action_result, attempt, r, not_sent)
+            if delay is None:
+                break
+            time.sleep(delay)
+            attempt += 1
+
+        return self._finish_post(endpoint, action_result, r, error_msg, body, stream_key)
+
+    async def post_async(self, session, endpoint, action_result, data):
+        # Counterpart of post for the async transport, with the same throttling, retries and
+        # response processing. The response body is read in full, so it cannot be streamed
+        import asyncio
+
+        url, body = self._prepare_post(endpoint, "post", data)
+        ret_val = self._check_circuit(endpoint, action_result)
+        if phantom.is_fail(ret_val):
+            return RetVal(ret_val, None)
+
+        attempt = 0
+        while True:
+            rate_limiter = self._get_rate_limiter(endpoint)
+            if rate_limiter is not None and await rate_limiter.acquire_async():
+                self._count_api_stat(action_result, "api_throttle_waits")
+            started = time.perf_counter()
+            try:
+                async with session.post(url.decode("utf-8"), data=body, headers={"Content-Type": "application/json"}) as response:
+                    r = BufferedResponse(response.status, response.headers, await response.read())
+                error_msg = None
+                not_sent = False
+            except Exception as e:
+                r = None
+                error_msg = str(e) or "Unknown error occurred. Please check the asset configuration parameters."
+                not_sent = self.async_transport.not_sent(e)
+            self._perf.record_request(endpoint, time.perf_counter() - started, len(r.content) if r is not None else 0)
+
+            delay = self._next_retry(endpoint, action_result, attempt, r, not_sent)
+            if delay is None:
+                break
+            await asyncio.sleep(delay)
+            attempt += 1
+
+        return self._finish_post(endpoint, action_result, r, error_msg, body)
+
+    def _check_circuit(self, endpoint, action_result):
+        if self._circuit_breaker is not None and not self._circuit_breaker.allow(self._base_url + endpoint):
+            self._count_api_stat(action_result, "api_circuit_open")
+            return action_result.set_status(phantom.APP_ERROR, f"Skipping {endpoint}, the endpoint is cooling down after repeated failures")
+        return phantom.APP_SUCCESS
+
+    @staticmethod
+    def _not_sent(error):
+        # True when the connection to the IronAPI could not be opened, so the request was never sent
+        import requests
+        from urllib3.exceptions import NewConnectionError
+
+        reason = getattr(error.args[0], "reason", None) if error.args else None
+        return isinstance(error, requests.exceptions.ConnectTimeout) or isinstance(reason, NewConnectionError)
+
+    def _next_retry(self, endpoint, action_result, attempt, r, not_sent):
+        # Returns the delay before the next attempt, or None when r is the final response
+        if attempt >= self._retry_count:
+            return None
+        # notification feeds consume what they return, a lost feed response is as final as a lost write
+        if endpoint in WRITE_ENDPOINTS or endpoint in FEED_ENDPOINTS.values():
+            if (r is None and not not_sent) or (r is not None and r.status_code not in WRITE_RETRY_STATUS_CODES):
+                return None
+        elif r is not None and r.status_code not in RETRY_STATUS_CODES:
+            return None
+
+        delay = self._retry_delay(attempt, r)
+        if r is not None:
+            r.close()
+        self._count_api_stat(action_result, "api_retries")
+        self._progress(f"Retrying {endpoint} in {delay:.1f} seconds (attempt {attempt + 1} of {self._retry_count})")
+        return delay
+
+    def _finish_post(self, endpoint, action_result, r, error_msg, body, stream_key=None):
+        if self._circuit_breaker is not None:
+            self._circuit_breaker.record(self._base_url + endpoint, r is not None and r.status_code not in RETRY_STATUS_CODES)
+
+        if r is None:
+            self._capture_failed_request(endpoint, action_result, body)
+            self._progress(f"Error while issuing REST call - {error_msg}")
+            return RetVal(action_result.set_status(phantom.APP_ERROR, f"Error Connecting to server. Details: {error_msg}"), None)
+
+        if stream_key is not None and 200 <= r.status_code < 399 and "json" in r.headers.get("Content-Type", ""):
+            return self._process_streamed_response(r, action_result, stream_key, endpoint)
+
+        ret_val, response = self._process_response(r, action_result)
+        if phantom.is_fail(ret_val):
+            self._capture_failed_request(endpoint, action_result, body)
+        return RetVal(ret_val, response)
+
+    def _retry_delay(self, attempt, r):
+        # Honor the server's Retry-After header, otherwise back off exponentially with full jitter
+        retry_after = r.headers.get("Retry-After") if r is not None else None
+        if retry_after:
+            try:
+                return min(max(0.0, float(retry_after)), MAX_RETRY_DELAY)
+            except ValueError:
+                try:
+                    delay = (parsedate_to_datetime(retry_after) - datetime.now(timezone.utc)).total_seconds()
+                    return min(max(0.0, delay), MAX_RETRY_DELAY)
+                except (TypeError, ValueError):
+                    pass
+        return random.uniform(0, min(MAX_RETRY_DELAY, self._retry_backoff * 2**attempt))
+
+    def _get_rate_limiter(self, endpoint):
+        rate = self._endpoint_rate_limits.get(endpoint, self._rate_limit)
+        if not rate:
+            return None
+        rate_limiter = self._rate_limiters.get(endpoint)
+        if rate_limiter is None:
+            rate_limiter = self._rate_limiters.setdefault(endpoint, TokenBucket(rate))
+        return rate_limiter
+
+    @staticmethod
+    def _count_api_stat(action_result, name):
+        summary = action_result.get_summary()
+        action_result.update_summary({name: summary.get(name, 0) + 1})
+
+    def cached_post(self, endpoint, action_result, data, alert_id_func):
+        # Serves read-only lookups from the response cache when possible. alert_id_func returns the alert id
+        # a call belongs to from its request data and response, so writes on that alert can invalidate it
+        response = self._get_cached_response(endpoint, data)
+        if response is not None:
+            return RetVal(phantom.APP_SUCCESS, response)
+
+        ret_val, response = self.post(endpoint, action_result, data=data, headers=None)
+        self._cache_response(endpoint, data, ret_val, response, alert_id_func)
+        return RetVal(ret_val, response)
+
+    def _get_cached_response(self, endpoint, data):
+        if self._response_cache is None or not self._response_cache.is_cacheable(endpoint):
+            return None
+
+        response = self._response_cache.get(endpoint, data)
+        if response is not None:
+            self._progress(f"Using cached response for {endpoint}")
+        return response
+
+    def _cache_response(self, endpoint, data, ret_val, response, alert_id_func):
+        if self._response_cache is not None and phantom.is_success(ret_val):
+            self._response_cache.put(endpoint, data, response, alert_id_func(data, response))
+
+    def invalidate_alert(self, alert_id):
+        if self._response_cache is not None:
+            self._response_cache.invalidate_alert(alert_id)
+
+    def post_all(self, calls, rate_limiter=None, alert_id_func=None):
+        # Posts every (endpoint, action_result, data) call, on the async transport when it is enabled and on
+        # the thread pool otherwise, and returns their RetVals in order. With alert_id_func the responses
+        # are looked up in and added to the response cache
+        if self.async_transport is None:
+
+            def post(endpoint, action_result, data):
+                if alert_id_func is None:
+                    return self.post(endpoint, action_result, data=data, headers=None)
+                return self.cached_post(endpoint, action_result, data, alert_id_func)
+
+            return self._run_concurrently(post, calls, rate_limiter)
+
+        results = [None] * len(calls)
+        pending = []
+        for index, (endpoint, _, data) in enumerate(calls):
+            response = self._get_cached_response(endpoint, data) if alert_id_func is not None else None
+            if response is not None:
+                results[index] = RetVal(phantom.APP_SUCCESS, response)
+            else:
+                pending.append(index)
+
+        for index, (ret_val, response) in zip(pending, self.async_transport.post_all([calls[index] for index in pending], rate_limiter)):
+            endpoint, _, data = calls[index]
+            if alert_id_func is not None:
+                self._cache_response(endpoint, data, ret_val, response, alert_id_func)
+            results[index] = RetVal(ret_val, response)
+        return results
+
+    def _run_concurrently(self, func, items, rate_limiter=None):
+        # Calls func with each tuple of arguments on a pool bounded by batch_parallelism and
+        # returns the results in the order of items. An optional rate limiter paces the calls
+        def call(args):
+            if rate_limiter is not None:
+                rate_limiter.acquire()
+            return func(*args)
+
+        if len(items) == 1:
+            return [call(items[0])]
+
+        with ThreadPoolExecutor(max_workers=min(self._batch_parallelism, len(items))) as executor:
+            return list(executor.map(call, items))
+
+    def _process_empty_response(self, response, action_result):
+        if response.status_code == 200:
+            return RetVal(phantom.APP_SUCCESS, {})
+
+        return RetVal(action_result.set_status(phantom.APP_ERROR, "Empty response and no information in the header"), None)
+
+    def _process_html_response(self, response, action_result):
+        # An html response, treat it like an error
+        status_code = response.status_code
+
+        # BeautifulSoup is only needed for these error responses, so it is imported here
+        from bs4 import BeautifulSoup
+
+        try:
+            soup = BeautifulSoup(response.text, "html.parser")
+            error_text = soup.text
+            split_lines = error_text.split("\n")
+            split_lines = [x.strip() for x in split_lines if x.strip()]
+            error_text = "\n".join(split_lines)
+        except:
+            error_text = "Cannot parse error details"
+
+        message = f"Status Code: {status_code}. Data from server:\n{error_text}\n"
+
+        message = message.replace("{", "{{").replace("}", "}}")
+
+        return RetVal(action_result.set_status(phantom.APP_ERROR, message), None)
+
+    def _process_json_response(self, r, action_result):
+        # Try a json parse
+        try:
+            resp_json = r.json()
+        except Exception as e:
+            return RetVal(action_result.set_status(phantom.APP_ERROR, f"Unable to parse JSON response. Error: {e}"), None)
+
+        # Please specify the status codes here
+        if 200 <= r.status_code < 399:
+            return RetVal(phantom.APP_SUCCESS, resp_json)
+
+        # You should process the error returned in the json
+        message = f"Error from server. Status Code: {r.status_code} Data from server: {r.text.replace('{', '{{').replace('}', '}}')}"
+
+        return RetVal(action_result.set_status(phantom.APP_ERROR, message), None)
+
+    def _process_streamed_response(self, r, action_result, stream_key, endpoint):
+        self._progress(f"Received response: Code:{r.status_code}, streaming {stream_key}")
+
+        # the body is consumed by the ingest loop, so only the status and headers are kept for debugging
+        if hasattr(action_result, "add_debug_data"):
+            action_result.add_debug_data({"r_status_code": r.status_code})
+            action_result.add_debug_data({"r_headers": r.headers})
+
+        # the body size is only known once the ingest loop has read the stream
+        stream = JsonArrayStream(r, stream_key, on_close=lambda nbytes: self._perf.add_bytes(endpoint, nbytes))
+        return RetVal(phantom.APP_SUCCESS, {stream_key: stream})
+
+    def _capture_failed_request(self, endpoint, action_result, body):
+        # the failure only policy does not log request payloads when they are sent, so a failed call logs its payload here
+        if self._debug_capture != DEBUG_CAPTURE_FAILURE:
+            return
+
+        self._progress(f"Failed {endpoint} request content: {body}")
+        if hasattr(action_result, "add_debug_data"):
+            action_result.add_debug_data({"request_content": body})
+
+    def _capture_response(self, r, action_result, failed):
+        # Only build the debug strings when the capture policy will actually emit them
+        if self._debug_capture == DEBUG_CAPTURE_OFF or (self._debug_capture == DEBUG_CAPTURE_FAILURE and not failed):
+            return
+
+        if self._debug_capture == DEBUG_CAPTURE_TRUNCATED and len(r.content) > self._debug_capture_bytes:
+            r_text = r.content[: self._debug_capture_bytes].decode("utf-8", "replace") + f"... ({len(r.content)} bytes)"
+        else:
+            r_text = r.text
+
+        self._progress(f"Received response: Code:{r.status_code}, Data:{r_text}")
+
+        # store the r_text in debug data, it will get dumped in the logs if the action fails
+        if hasattr(action_result, "add_debug_data"):
+            action_result.add_debug_data({"r_status_code": r.status_code})
+            action_result.add_debug_data({"r_text": r_text})
+            action_result.add_debug_data({"r_headers": r.headers})
+
+    def _process_response(self, r, action_result):
+        started = time.perf_counter()
+        ret_val, response = self._parse_response(r, action_result)
+        self._perf.add_time("parse", time.perf_counter() - started)
+        self._capture_response(r, action_result, phantom.is_fail(ret_val))
+        return RetVal(ret_val, response)
+
+    def _parse_response(self, r, action_result):
+        # Process each 'Content-Type' of response separately
+
+        # Process a json response
+        if "json" in r.headers.get("Content-Type", ""):
+            return self._process_json_response(r, action_result)
+
+        # Process an HTML response, Do this no matter what the api talks.
+        # There is a high chance of a PROXY in between phantom and the rest of
+        # world, in case of errors, PROXY's return HTML, this function parses
+        # the error and adds it to the action_result.
+        if "html" in r.headers.get("Content-Type", ""):
+            return self._process_html_response(r, action_result)
+
+        # it's not content-type that is to be parsed, handle an empty response
+        if not r.text:
+            return self._process_empty_response(r, action_result)
+
+        # everything else is actually an error at this point
+        message = (
+            f"Can't process response from server. Status Code: {r.status_code} "
+            + f"Data from server: {r.text.replace('{', '{{').replace('}', '}}')}"
+        )
+
+        return RetVal(action_result.set_status(phantom.APP_ERROR, message), None)
+
+
+class Alert:
+    # IronDefense alert whose fields are read from the raw alert when they are used, so the fields of
+    # an alert the notification filter drops are never looked up or converted
+    __slots__ = ("raw",)
+
+    def __init__(self, raw):
+        self.raw = raw
+
+    @property
+    def id(self):
+        return self.raw["id"]
+
+    @property
+    def category(self):
+        return self.raw["category"]
+
+    @property
+    def sub_category(self):
+        return self.raw["sub_category"]
+
+    @property
+    def severity(self):
+        return int(self.raw["severity"])
+
+    @property
+    def updated(self):
+        return self.raw["updated"]
+
+    @property
+    def display_name(self):
+        return f"{self.category}/{self.sub_category}"
+
+
+class Event(Alert):
+    # IronDefense event, read on use like Alert
+    __slots__ = ()
+
+    @property
+    def alert_id(self):
+        return self.raw.get("alert_id")
+
+
+def display_enum(value):
+    # Drops the IronAPI enum prefix for display, "ANA_ALERT_CREATED" -> "ALERT CREATED"
+    return value[4:].replace("_", " ") if value else ""
+
+
+class AlertNotification:
+    # action keeps the IronAPI enum the notification filter matches on, action_name is its display form.
+    # id is the id of the notified alert, used for the feed checkpoint. Fields are read on use
+    __slots__ = ("raw",)
+
+    def __init__(self, raw):
+        self.raw = raw
+
+    @property
+    def action(self):
+        return self.raw.get("alert_action")
+
+    @property
+    def action_name(self):
+        return display_enum(self.action)
+
+    @property
+    def alert(self):
+        return Alert(self.raw["alert"]) if self.raw.get("alert") else None
+
+    @property
+    def created(self):
+        return self.raw.get("created")
+
+    @property
+    def id(self):
+        return (self.raw.get("alert") or {}).get("id")
+
+
+class EventNotification:
+    __slots__ = ("raw",)
+
+    def __init__(self, raw):
+        self.raw = raw
+
+    @property
+    def action(self):
+        return self.raw.get("event_action")
+
+    @property
+    def action_name(self):
+        return display_enum(self.action)
+
+    @property
+    def event(self):
+        return Event(self.raw["event"]) if self.raw.get("event") else None
+
+    @property
+    def created(self):
+        return self.raw.get("created")
+
+    @property
+    def id(self):
+        return (self.raw.get("event") or {}).get("id")
+
+
+class DomeNotification:
+    __slots__ = ("raw",)
+
+    def __init__(self, raw):
+        self.raw = raw
+
+    @property
+    def id(self):
+        return self.raw.get("id")
+
+    @property
+    def category(self):
+        return self.raw["category"]
+
+    @property
+    def category_name(self):
+        return display_enum(self.category)
+
+    @property
+    def alert_ids(self):
+        return self.raw.get("alert_ids") or []
+
+    @property
+    def created(self):
+        return self.raw.get("created")
+
+
+# Record type of the notifications in each notification feed
+NOTIFICATION_TYPES = {"alert": AlertNotification, "dome": DomeNotification, "event": EventNotification}
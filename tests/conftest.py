@@ -0,0 +1,62 @@
+# Copyright (c) 2025 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# File: conftest.py
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions
+# and limitations under the License.
+#
+# Unit tests run against the stubbed platform modules of the benchmarks when the SOAR SDK is not installed
+import json
+import os
+import sys
+
+import pytest
+
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+sys.path.insert(0, APP_DIR)
+try:
+    import phantom.app  # noqa: F401
+except ImportError:
+    sys.path.insert(0, os.path.join(APP_DIR, "benchmarks", "phantom_stub"))
+
+
+@pytest.fixture
+def connector(tmp_path):
+    # An initialized connector with the asset defaults from the app JSON and its state directory in tmp_path
+    from ironnet_connector import IronnetConnector
+
+    with open(os.path.join(APP_DIR, "ironnet.json")) as f:
+        configuration = json.load(f)["configuration"]
+
+    def make(**overrides):
+        connector = IronnetConnector()
+        connector.action_id = "on_poll"
+        connector.get_state_dir = lambda: str(tmp_path)
+        connector.config = {name: spec["default"] for name, spec in configuration.items() if "default" in spec}
+        connector.config.update({"base_url": "https://irondefense.example", "username": "user", "password": "password"})
+        connector.config.update(overrides)
+        assert connector.initialize()
+        return connector
+
+    return make
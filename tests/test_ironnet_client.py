@@ -0,0 +1,108 @@
+# Copyright (c) 2025 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# File: test_ironnet_client.py
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions
+# and limitations under the License.
+import json
+
+import pytest
+
+from ironnet_client import JsonArrayStream
+
+
+class StreamedResponse:
+    # Serves a response body in the given chunks, the way requests streams it with iter_content
+    def __init__(self, chunks):
+        self._chunks = chunks
+        self.closed = False
+
+    def iter_content(self, chunk_size):
+        yield from self._chunks
+
+    def close(self):
+        self.closed = True
+
+
+def chunked(body, size):
+    data = body.encode("utf-8")
+    return [data[i : i + size] for i in range(0, len(data), size)]
+
+
+BODY = json.dumps(
+    {
+        "constraint": {"total": 8},
+        "alert_notifications": [{"id": "a", "ids": [1, 2]}, 1500.0, -2e-3, 'quoted "] text', True, None, 7, "caf\u00e9 \u2713"],
+    },
+    ensure_ascii=False,
+)
+
+
+@pytest.mark.parametrize("size", range(1, len(BODY.encode("utf-8")) + 1))
+def test_decodes_elements_split_at_any_chunk_boundary(size):
+    response = StreamedResponse(chunked(BODY, size))
+    stream = JsonArrayStream(response, "alert_notifications")
+
+    assert list(stream) == json.loads(BODY)["alert_notifications"]
+    assert stream.error is None
+    assert stream.count == 8
+    assert response.closed
+
+
+def test_number_split_after_its_decimal_point():
+    stream = JsonArrayStream(StreamedResponse([b'{"alert_notifications": [1500.', b"0, 2]}"]), "alert_notifications")
+
+    assert list(stream) == [1500.0, 2]
+    assert stream.error is None
+
+
+def test_literal_split_across_chunks():
+    stream = JsonArrayStream(StreamedResponse([b'{"alert_notifications": [tr', b"ue, nu", b"ll]}"]), "alert_notifications")
+
+    assert list(stream) == [True, None]
+    assert stream.error is None
+
+
+def test_missing_key_sets_error():
+    response = StreamedResponse([b'{"event_notifications": []}'])
+    stream = JsonArrayStream(response, "alert_notifications")
+
+    assert list(stream) == []
+    assert isinstance(stream.error, ValueError)
+    assert response.closed
+
+
+def test_truncated_array_keeps_elements_read_before_the_error():
+    stream = JsonArrayStream(StreamedResponse([b'{"alert_notifications": [{"id": 1}, {"id": 2}, {"id"']), "alert_notifications")
+
+    assert list(stream) == [{"id": 1}, {"id": 2}]
+    assert isinstance(stream.error, ValueError)
+
+
+def test_on_close_reports_bytes_read():
+    read = []
+    chunks = chunked(BODY, 16)
+    stream = JsonArrayStream(StreamedResponse(chunks), "alert_notifications", on_close=read.append)
+
+    list(stream)
+
+    assert read == [len(BODY.encode("utf-8"))]
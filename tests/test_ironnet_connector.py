@@ -0,0 +1,262 @@
+# Copyright (c) 2025 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# File: test_ironnet_connector.py
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions
+# and limitations under the License.
+import phantom.app as phantom
+from phantom.action_result import ActionResult
+
+from ironnet_connector import STATE_SCHEMA_VERSION, NotificationSpool, RowAcks, StateStore, id_digest
+
+
+def alert_notification(alert_id, severity=900, **alert):
+    alert = {"id": alert_id, "category": "C2", "sub_category": "BEACONING", "severity": severity, "updated": f"{alert_id}-updated", **alert}
+    return {"alert_action": "ANA_ALERT_CREATED", "created": "2025-01-01T00:00:00Z", "alert": alert}
+
+
+class Platform:
+    # The state persistence of BaseConnector
+    def __init__(self, state=None):
+        self.state = state
+        self.saves = 0
+
+    def load_state(self):
+        return self.state
+
+    def save_state(self, state):
+        self.saves += 1
+        self.state = state
+
+    def save_progress(self, *args):
+        pass
+
+
+def test_spool_returns_pending_rows_oldest_first(tmp_path):
+    spool = NotificationSpool(str(tmp_path / "spool.db"))
+    spool.append("primary", "alert", [{"n": 1}, {"n": 2}])
+    spool.append("primary", "event", [{"n": 3}])
+
+    row_ids, notifications = spool.pending("primary", "alert")
+
+    assert notifications == [{"n": 1}, {"n": 2}]
+    assert row_ids == sorted(row_ids)
+    assert spool.count("primary", "event") == 1
+
+
+def test_spool_ack_deletes_rows(tmp_path):
+    spool = NotificationSpool(str(tmp_path / "spool.db"))
+    spool.append("primary", "alert", [{"n": 1}, {"n": 2}])
+    row_ids, _ = spool.pending("primary", "alert")
+
+    spool.ack(row_ids[:1])
+
+    assert spool.pending("primary", "alert")[1] == [{"n": 2}]
+
+
+def test_spool_dead_letters_rows_out_of_attempts(tmp_path):
+    spool = NotificationSpool(str(tmp_path / "spool.db"))
+    spool.append("primary", "alert", [{"n": 1}, {"n": 2}])
+    row_ids, _ = spool.pending("primary", "alert")
+
+    assert spool.fail(row_ids[:1], 2) == 0
+    assert spool.fail(row_ids[:1], 2) == 1
+
+    assert spool.pending("primary", "alert")[1] == [{"n": 2}]
+    assert spool._db.execute("SELECT notification, attempts FROM dead_letter").fetchall() == [('{"n": 1}', 2)]
+
+
+def test_spool_retain_drops_removed_appliances(tmp_path):
+    spool = NotificationSpool(str(tmp_path / "spool.db"))
+    spool.append("primary", "alert", [{"n": 1}])
+    spool.append("removed", "alert", [{"n": 2}])
+
+    spool.retain(["primary"])
+
+    assert spool.count("primary", "alert") == 1
+    assert spool.count("removed", "alert") == 0
+
+
+def test_row_acks_ack_rows_once_their_artifacts_are_saved():
+    rows = RowAcks()
+    rows.track(1)
+    claimed = rows.claim()
+    rows.track(2)  # row 2 adds no artifact
+    rows.track(3)
+
+    assert rows.acked == [2]
+
+    rows.settle(claimed)
+    rows.track(None)
+
+    assert rows.acked == [2, 1, 3]
+    assert not rows.failed
+
+
+def test_row_acks_never_ack_failed_rows():
+    rows = RowAcks()
+    rows.track(1)
+    rows.fail(rows.claim())
+    rows.track(None)
+
+    assert rows.acked == []
+    assert rows.failed == {1}
+
+
+def test_row_acks_abandon_fails_the_current_row_only():
+    rows = RowAcks()
+    rows.track(1)
+    rows.claim()
+    rows.track(2)
+
+    assert rows.abandon() == 2
+    assert rows.failed == {2}
+    # row 1 was never saved, so it is neither acknowledged nor failed
+    rows.track(None)
+    assert rows.acked == []
+
+
+def test_poison_row_is_failed_and_dead_lettered(connector, tmp_path):
+    connector = connector(notification_spool=True, max_ingest_attempts=2)
+    connector._spool = NotificationSpool(str(tmp_path / "spool.db"))
+    poison = alert_notification("poison")
+    del poison["alert"]["updated"]
+    connector._spool.append(connector._appliance.name, "alert", [alert_notification("a1"), poison, alert_notification("a2")])
+
+    for _ in range(2):
+        action_result = ActionResult({})
+        ret_val = connector._ingest_spooled("alert", connector._ingest_alert_notifications, action_result)
+        assert phantom.is_fail(ret_val)
+
+    assert set(connector.containers) == {"a1", "a2"}
+    assert connector._spool.count(connector._appliance.name, "alert") == 0
+    assert connector._spool._db.execute("SELECT COUNT(*) FROM dead_letter").fetchone()[0] == 1
+
+
+def test_filtered_notifications_are_not_parsed(connector, tmp_path):
+    connector = connector(notification_spool=True)
+    connector._spool = NotificationSpool(str(tmp_path / "spool.db"))
+    # below the severity filter, its missing fields are never read
+    connector._spool.append(
+        connector._appliance.name, "alert", [{"alert_action": "ANA_ALERT_CREATED", "alert": {"id": "low", "category": "C2", "severity": 1}}]
+    )
+
+    ret_val = connector._ingest_spooled("alert", connector._ingest_alert_notifications, ActionResult({}))
+
+    assert phantom.is_success(ret_val)
+    assert connector._spool.count(connector._appliance.name, "alert") == 0
+    assert not connector.containers
+
+
+def test_failing_deferred_notification_is_dropped_after_max_attempts(connector):
+    connector = connector(max_ingest_attempts=2)
+    poison = alert_notification("poison")
+    del poison["alert"]["updated"]
+    state = connector._appliance.state
+    state["deferred_notifications"] = {"alert": [alert_notification("a1"), poison]}
+
+    connector._ingest_deferred("alert", connector._ingest_alert_notifications, ActionResult({}))
+
+    assert state["deferred_notifications"]["alert"] == [poison]
+    assert state["deferred_attempts"]["alert"] == [1]
+
+    connector._ingest_deferred("alert", connector._ingest_alert_notifications, ActionResult({}))
+
+    assert "alert" not in state["deferred_notifications"]
+    assert set(connector.containers) == {"a1"}
+
+
+def test_state_store_migrates_version_1_state():
+    store = StateStore(Platform({"checkpoints": {"alert": {"last_created": "2025"}}}))
+
+    state = store.load()
+
+    assert state["schema_version"] == STATE_SCHEMA_VERSION
+    assert state["checkpoints"] == {"alert": {"last_created": "2025"}}
+
+
+def test_state_store_saves_id_sets_as_digests():
+    platform = Platform()
+    store = StateStore(platform)
+    store.load()["seen_artifacts"] = dict.fromkeys([id_digest("a"), id_digest("b")])
+
+    assert store.save()
+    assert isinstance(platform.state["seen_artifacts"], str)
+    assert list(StateStore(platform).load()["seen_artifacts"]) == [id_digest("a"), id_digest("b")]
+
+
+def test_state_store_only_saves_changes():
+    platform = Platform({"schema_version": STATE_SCHEMA_VERSION, "checkpoints": {}})
+    store = StateStore(platform)
+    store.load()
+
+    assert not store.save()
+
+    store.data["checkpoints"]["alert"] = {"last_created": "2025"}
+
+    assert store.save()
+    assert platform.saves == 1
+
+
+def test_state_store_leaves_newer_state_untouched():
+    newer = {"schema_version": STATE_SCHEMA_VERSION + 1, "checkpoints": {"alert": {"cursor": "abc"}}}
+    platform = Platform(dict(newer))
+    store = StateStore(platform)
+
+    assert "checkpoints" not in store.load()
+    assert store.read_only
+
+    store.data["checkpoints"] = {}
+
+    assert not store.save()
+    assert platform.state == newer
+    assert platform.saves == 0
+
+
+def test_state_store_fills_snapshot_sections_on_save():
+    platform = Platform()
+    store = StateStore(platform)
+    store.load()
+    breakers = {"https://irondefense.example/IronApi/GetAlerts": {"failures": 1, "open_until": 0}}
+    store.add_snapshot("circuit_breakers", lambda: dict(breakers))
+
+    store.save()
+    assert platform.state["circuit_breakers"] == breakers
+
+    breakers.clear()
+    store.save()
+    assert "circuit_breakers" not in platform.state
+
+
+def test_prefetch_only_covers_alerts_new_to_the_platform(connector):
+    connector = connector(alert_context_prefetch="artifacts")
+    response = {"alert_notifications": [alert_notification("a1"), alert_notification("a1")]}
+
+    connector._ingest_alert_notifications(phantom.APP_SUCCESS, response, ActionResult({}))
+
+    assert list(connector._appliance.new_alerts) == ["a1"]
+
+    connector._appliance.new_alerts = {}
+    updated = {"alert_notifications": [alert_notification("a1", updated="later"), alert_notification("a2")]}
+    connector._ingest_alert_notifications(phantom.APP_SUCCESS, updated, ActionResult({}))
+
+    assert list(connector._appliance.new_alerts) == ["a2"]